@@ -50,7 +50,11 @@ Voltages (from SC8P052.ini):
 
 import sys
 import time
+import struct
+import binascii
+import contextlib
 import argparse
+from array import array
 
 # === VERIFIED CONFIGURATION ===
 MCU_NAME = "SC8P052"
@@ -67,6 +71,7 @@ VDD_VOLTAGE = 3.3
 PROG_PULSE_US = 200         # PROGTIME=200 from SC8P052.ini
 ENTRY_DELAY_MS = 30         # FUN_000005e0(0x1e) = 30ms
 PROG_TIMEOUT_MS = 30        # FUN_00008010 parameter 0x1e
+BUSY_WAIT_MAX_US = 100      # Shorter host delays spin instead of sleeping
 
 # Entry Key - CONFIRMED from lines 4927-4930 in Writer8_lite.c
 ENTRY_KEY = [0x9B, 0x29, 0x64, 0xD6]
@@ -105,6 +110,28 @@ class AREA_MASK:
     EEPROM_READ    = 0x8000   # EEPROM uses same as ROM (SC8P052 has no EEPROM)
     SPECIAL        = 0x0004   # Special mode (line 11129)
 
+# === BIT ORDER ===
+# REV8[b] is byte b with its bit order reversed. MSB-first transfers are
+# mirrored once up front so the bit-bang loops only ever walk LSB-first.
+REV8 = bytes(int(f"{i:08b}"[::-1], 2) for i in range(256))
+
+def reverse_bits(data: int, count: int) -> int:
+    """Reverse the order of the low `count` bits of data (count <= 16)."""
+    rev16 = (REV8[data & 0xFF] << 8) | REV8[(data >> 8) & 0xFF]
+    return rev16 >> (16 - count)
+
+def wire_bits(data: int, count: int) -> bytes:
+    """Return the low `count` bits of data as an LSB-first 0/1 sequence."""
+    return bytes((data >> i) & 1 for i in range(count))
+
+# Every ICSP command is a fixed byte, so its wire sequence is built once
+CMD_BITS = {cmd: wire_bits(cmd, 8)
+            for name, cmd in vars(ICSP_CMD).items() if name.isupper()}
+
+# Likewise for the handful of 16-bit area masks sent after SETUP
+AREA_BITS = {mask: wire_bits(mask, 16)
+             for name, mask in vars(AREA_MASK).items() if name.isupper()}
+
 # === HARDWARE ABSTRACTION LAYER ===
 class Hardware:
     """
@@ -118,8 +145,14 @@ class Hardware:
       PA2 - VPP/MCLR (High Voltage Programming)
     """
 
-    def __init__(self, simulation=True):
+    def __init__(self, simulation=True, busy_wait=True):
         self.simulation = simulation
+        # time.sleep() cannot resolve the 1 µs bit periods (~50 µs minimum on
+        # Linux), so short hardware delays spin on perf_counter_ns() instead
+        self.busy_wait = busy_wait
+        self.spin_overhead_ns = 0
+        if busy_wait and not simulation:
+            self._calibrate()
         self.dat_pin = 0
         self.clk_pin = 0
         self.vpp_enabled = False
@@ -127,9 +160,14 @@ class Hardware:
         self.vpp_voltage = 0.0
 
         # Simulated memory
-        self.sim_flash = {i: 0x3FFF for i in range(ROM_SIZE_WORDS)}
-        self.sim_config = [0x3FFF] * CONFIG_WORDS
+        self.sim_flash = blank_image()
+        self.sim_config = blank_image(CONFIG_WORDS)
         self.sim_address = 0
+        self.sim_area = AREA_MASK.ROM_READ
+        self.sim_latch = 0x3FFF
+        self.sim_last_cmd = None
+        self.sim_word = 0x3FFF      # Shift register loaded by READ_DATA
+        self.sim_bit = 0
 
         print(f"[HW] Initialized {MCU_NAME} Programmer")
         print(f"[HW] Mode: {'SIMULATION' if simulation else 'HARDWARE'}")
@@ -160,9 +198,9 @@ class Hardware:
     def get_dat(self) -> int:
         """Read data pin state"""
         if self.simulation:
-            # In simulation, return bit from current address
-            word = self.sim_flash.get(self.sim_address, 0x3FFF)
-            return 1  # Default high
+            # Shift the word latched by READ_DATA out MSB first
+            self.sim_bit = (self.sim_bit - 1) & 0xF
+            return (self.sim_word >> self.sim_bit) & 1
         return 1  # Implement for real hardware
 
     def set_clk(self, value: int):
@@ -170,13 +208,35 @@ class Hardware:
         self.clk_pin = value & 1
 
     def delay_us(self, microseconds: int):
-        """Microsecond delay"""
-        time.sleep(microseconds / 1_000_000)
+        """Microsecond delay (no-op in simulation)"""
+        if self.simulation:
+            return
+        if self.busy_wait and microseconds < BUSY_WAIT_MAX_US:
+            self._busy_wait_ns(microseconds * 1000 - self.spin_overhead_ns)
+        else:
+            time.sleep(microseconds / 1_000_000)
 
     def delay_ms(self, milliseconds: int):
-        """Millisecond delay"""
+        """Millisecond delay (no-op in simulation)"""
+        if self.simulation:
+            return
         time.sleep(milliseconds / 1_000)
 
+    def _busy_wait_ns(self, nanoseconds: int):
+        """Spin until the given number of nanoseconds has passed."""
+        deadline = time.perf_counter_ns() + nanoseconds
+        while time.perf_counter_ns() < deadline:
+            pass
+
+    def _calibrate(self):
+        """Measure the fixed cost of a zero-length spin so delay_us can subtract it."""
+        samples = []
+        for _ in range(101):
+            start = time.perf_counter_ns()
+            self._busy_wait_ns(0)
+            samples.append(time.perf_counter_ns() - start)
+        self.spin_overhead_ns = sorted(samples)[len(samples) // 2]
+
     def send_bits(self, data: int, count: int, lsb_first: bool = True):
         """
         Bit-bang data out on DAT/CLK pins.
@@ -186,21 +246,34 @@ class Hardware:
         - LSB First: param_1 >> 1 each iteration
 
         Evidence: FUN_00003f48 at line 5200 does "param_1 = param_1 >> 1"
-        """
-        for i in range(count):
-            if lsb_first:
-                bit = (data >> i) & 1
-            else:
-                bit = (data >> (count - 1 - i)) & 1
 
-            self.set_clk(0)          # CLK LOW
-            self.set_dat(bit)        # Set data
-            self.delay_us(1)
-            self.set_clk(1)          # CLK HIGH (latch)
-            self.delay_us(1)
-
-        self.set_clk(0)              # Return CLK low
-        self.delay_us(1)
+        In simulation there is nothing to clock, so the whole word is
+        latched at once and the pins are left in their final state; no
+        transfer time is spent since delays are no-ops without a target.
+        """
+        if self.simulation:
+            if count == 16:
+                self._sim_data(data & 0xFFFF)
+            self.dat_pin = ((data >> (count - 1)) & 1) if lsb_first else (data & 1)
+            self.clk_pin = 0
+            return
+
+        if not lsb_first:
+            data = reverse_bits(data, count)
+        self.emit_bits(wire_bits(data, count))
+
+    def emit_bits(self, bits: bytes):
+        """Clock out a precomputed LSB-first bit sequence (see wire_bits)."""
+        set_clk, set_dat, delay_us = self.set_clk, self.set_dat, self.delay_us
+        for bit in bits:
+            set_clk(0)               # CLK LOW
+            set_dat(bit)             # Set data
+            delay_us(1)
+            set_clk(1)               # CLK HIGH (latch)
+            delay_us(1)
+
+        set_clk(0)                   # Return CLK low
+        delay_us(1)
 
     def read_bits(self, count: int, msb_first: bool = True) -> int:
         """
@@ -212,25 +285,31 @@ class Hardware:
         Evidence: FUN_00003ca4 at line 5015:
         local_28 = (uint)(_DAT_40010c08 << 0x1a) >> 0x1f | (local_28 & 0x7fff) << 1
         This shifts left and ORs new bit = MSB first
+
+        In simulation the word latched by READ_DATA is returned directly,
+        without clocking or delays.
         """
+        if self.simulation:
+            self.clk_pin = 0
+            self.sim_bit = 0
+            return self.sim_word & ((1 << count) - 1)
+
         data = 0
         self.set_dat_direction(True)  # Input mode
 
+        set_clk, get_dat, delay_us = self.set_clk, self.get_dat, self.delay_us
         for i in range(count):
-            self.set_clk(0)
-            self.delay_us(1)
-            self.set_clk(1)           # Rising edge
-            self.delay_us(1)
-
-            bit = self.get_dat()
+            set_clk(0)
+            delay_us(1)
+            set_clk(1)                # Rising edge
+            delay_us(1)
 
-            if msb_first:
-                data = (data << 1) | bit
-            else:
-                data |= (bit << i)
+            data |= get_dat() << i
 
-        self.set_clk(0)
+        set_clk(0)
         self.set_dat_direction(False)  # Output mode
+        if msb_first:
+            data = reverse_bits(data, count)
         return data
 
     def send_command(self, cmd: int):
@@ -240,7 +319,13 @@ class Hardware:
         Evidence: All command functions (FUN_00003e7c, FUN_00003ec0, FUN_00003f04)
         use FUN_00003f48 or similar which sends LSB first.
         """
-        self.send_bits(cmd, 8, lsb_first=True)
+        if self.simulation:
+            self.dat_pin = (cmd >> 7) & 1
+            self.clk_pin = 0
+            self._sim_command(cmd)
+        else:
+            bits = CMD_BITS.get(cmd)
+            self.emit_bits(bits if bits is not None else wire_bits(cmd, 8))
         self.delay_us(5)  # Inter-command delay
 
     def select_area(self, area_mask: int):
@@ -264,42 +349,120 @@ class Hardware:
             area_mask: AREA_MASK.ROM_READ, AREA_MASK.CONFIG_WRITE, etc.
         """
         self.send_command(ICSP_CMD.SETUP)
-        self.send_bits(area_mask, 16, lsb_first=True)
+        if self.simulation:
+            self._sim_data(area_mask)
+        else:
+            bits = AREA_BITS.get(area_mask)
+            self.emit_bits(bits if bits is not None else wire_bits(area_mask, 16))
         self.delay_us(10)
 
+    # --- Simulated target ---
+    # Minimal model of the ICSP state machine so that reads return what was
+    # programmed: SETUP selects the area, RESET/INCREMENT move the address
+    # counter, LOAD_DATA fills the latch and BEGIN_PROG burns it.
+
+    def _sim_command(self, cmd: int):
+        if cmd == ICSP_CMD.RESET_ADDR:
+            self.sim_address = 0
+        elif cmd == ICSP_CMD.INCREMENT_ADDR:
+            self.sim_address += 1
+        elif cmd == ICSP_CMD.BEGIN_PROG:
+            self._sim_write(self.sim_latch)
+        elif cmd == ICSP_CMD.READ_DATA:
+            self.sim_word = self._sim_read()
+            self.sim_bit = 0
+        self.sim_last_cmd = cmd
+
+    def _sim_data(self, data: int):
+        """16-bit payload following the last command."""
+        if self.sim_last_cmd == ICSP_CMD.SETUP:
+            self.sim_area = data
+        elif self.sim_last_cmd == ICSP_CMD.LOAD_DATA:
+            self.sim_latch = data & 0x3FFF
+
+    def _sim_memory(self):
+        if self.sim_area & 0x4000:
+            return self.sim_config
+        return self.sim_flash
+
+    def _sim_read(self) -> int:
+        memory = self._sim_memory()
+        if self.sim_address < len(memory):
+            return memory[self.sim_address]
+        return 0x3FFF
+
+    def _sim_write(self, word: int):
+        memory = self._sim_memory()
+        if self.sim_address < len(memory):
+            # OTP cells can only be programmed from 1 to 0
+            memory[self.sim_address] &= word
+
+# === MEMORY IMAGES ===
+# Flash contents are kept as a flat array('H') indexed by word address,
+# with unprogrammed words holding the blank value 0x3FFF.
+
+def blank_image(size: int = ROM_SIZE_WORDS) -> array:
+    """Return a blank (all 0x3FFF) memory image of `size` words."""
+    return array('H', [0x3FFF]) * size
+
+def image_end(memory: array) -> int:
+    """Return one past the highest non-blank word address (0 if blank)."""
+    for addr in range(len(memory) - 1, -1, -1):
+        if memory[addr] != 0x3FFF:
+            return addr + 1
+    return 0
+
 # === INTEL HEX PARSER ===
-def parse_hex_file(filename: str) -> dict:
-    """Parse Intel HEX file and return word-addressed memory dict."""
+def parse_hex_file(filename: str) -> array:
+    """Parse Intel HEX file and return a word-addressed ROM image."""
     print(f"[HEX] Parsing {filename}...")
-    memory = {}
+    memory = blank_image()
+    loaded = 0
+    ignored = 0
 
     try:
-        with open(filename, 'r') as f:
-            for line in f:
-                line = line.strip()
-                if not line.startswith(':'):
-                    continue
-
-                byte_count = int(line[1:3], 16)
-                address = int(line[3:7], 16)
-                record_type = int(line[7:9], 16)
-                data = bytes.fromhex(line[9:9 + byte_count * 2])
-
-                if record_type == 0x00:  # Data record
-                    # SC8P052 is 14-bit word-addressable
-                    # HEX file uses byte addresses, divide by 2 for word address
-                    for i in range(0, len(data), 2):
-                        if i + 1 < len(data):
-                            word = data[i] | (data[i + 1] << 8)
-                            word_addr = (address + i) // 2
-                            memory[word_addr] = word & 0x3FFF  # Mask to 14 bits
-                elif record_type == 0x01:  # EOF
-                    break
+        with open(filename, 'rb') as f:
+            # Images are a few KB at most (ROM is 2 KB): read the file in one
+            # call and parse from memory instead of interleaving I/O per line
+            lines = f.read().splitlines()
     except FileNotFoundError:
         print(f"[HEX] Error: File not found: {filename}")
         sys.exit(1)
 
-    print(f"[HEX] Loaded {len(memory)} words")
+    for line in lines:
+        line = line.strip()
+        if not line.startswith(b':'):
+            continue
+
+        # Decode the whole record (count, address, type, data,
+        # checksum) in one call instead of slicing each field. Lines stay
+        # bytes throughout, so no text decoding is done either.
+        record = binascii.a2b_hex(line[1:])
+        byte_count = record[0]
+        address = (record[1] << 8) | record[2]
+        record_type = record[3]
+        data = record[4:4 + byte_count]
+
+        if record_type == 0x00:  # Data record
+            # SC8P052 is 14-bit word-addressable
+            # HEX file uses byte addresses, divide by 2 for word address
+            # Words are little-endian byte pairs; a trailing odd byte is dropped
+            n_words = len(data) // 2
+            words = struct.unpack_from(f"<{n_words}H", data)
+            word_addr = address // 2
+
+            # Words outside ROM (e.g. config at 0x2007) are not flash
+            n_rom = max(0, min(n_words, ROM_SIZE_WORDS - word_addr))
+            memory[word_addr:word_addr + n_rom] = array(
+                'H', [w & 0x3FFF for w in words[:n_rom]])  # Mask to 14 bits
+            loaded += n_rom
+            ignored += n_words - n_rom
+        elif record_type == 0x01:  # EOF
+            break
+
+    print(f"[HEX] Loaded {loaded} words")
+    if ignored:
+        print(f"[HEX] Ignored {ignored} words outside ROM (0x0000 - 0x{ROM_SIZE_WORDS - 1:04X})")
     return memory
 
 # === HIGH-LEVEL ICSP OPERATIONS ===
@@ -366,6 +529,21 @@ def exit_programming_mode(hw: Hardware):
     hw.set_vdd(False)
     hw.delay_ms(10)
 
+@contextlib.contextmanager
+def programming_session(hw: Hardware):
+    """
+    Keep the device in programming mode for the duration of a with-block.
+
+    Composed operations (e.g. program + verify) share one power-up and
+    entry sequence instead of paying the VDD/VPP settling delays per step.
+    VPP and VDD are switched off even if the block raises.
+    """
+    enter_programming_mode(hw)
+    try:
+        yield hw
+    finally:
+        exit_programming_mode(hw)
+
 def reset_address(hw: Hardware):
     """
     Reset address counter to 0.
@@ -382,6 +560,12 @@ def increment_address(hw: Hardware):
     """
     hw.send_command(ICSP_CMD.INCREMENT_ADDR)
 
+def skip_addresses(hw: Hardware, count: int):
+    """Advance the address counter by `count` words without touching them."""
+    send_command = hw.send_command
+    for _ in range(count):
+        send_command(ICSP_CMD.INCREMENT_ADDR)
+
 def read_word(hw: Hardware) -> int:
     """
     Read 14-bit word from current address.
@@ -454,7 +638,7 @@ def erase_chip(hw: Hardware):
     hw.delay_ms(10)
 
 
-def read_config(hw: Hardware) -> list:
+def read_config(hw: Hardware) -> array:
     """
     Read configuration words.
 
@@ -462,7 +646,7 @@ def read_config(hw: Hardware) -> list:
     at line 9919 to select config area.
 
     Returns:
-        List of config words (CONFIGLENTH=2 for SC8P052, +1 padding = 3 total)
+        array('H') of config words (CONFIGLENTH=2 for SC8P052, +1 padding = 3 total)
     """
     print("\n[READ] Reading configuration words...")
     enter_programming_mode(hw)
@@ -471,10 +655,10 @@ def read_config(hw: Hardware) -> list:
     select_area(hw, AREA_MASK.CONFIG_READ)
     reset_address(hw)
 
-    config = []
+    config = blank_image(CONFIG_WORDS)
     for i in range(CONFIG_WORDS):
         word = read_word(hw)
-        config.append(word)
+        config[i] = word
         increment_address(hw)
         print(f"  Config[{i}]: 0x{word:04X}")
 
@@ -482,7 +666,7 @@ def read_config(hw: Hardware) -> list:
     return config
 
 
-def program_config(hw: Hardware, config_words: list):
+def program_config(hw: Hardware, config_words):
     """
     Program configuration words.
 
@@ -490,8 +674,9 @@ def program_config(hw: Hardware, config_words: list):
     at lines 5738, 5966, 11909, etc.
 
     Args:
-        config_words: List of config words to program
+        config_words: Iterable of config words to program
     """
+    config_words = array('H', config_words)
     print(f"\n[PROG] Programming {len(config_words)} config words...")
     enter_programming_mode(hw)
 
@@ -542,8 +727,8 @@ def check_connection(hw: Hardware) -> bool:
     exit_programming_mode(hw)
     return valid
 
-def read_flash(hw: Hardware, start_addr: int = 0, count: int = ROM_SIZE_WORDS) -> dict:
-    """Read flash memory contents."""
+def read_flash(hw: Hardware, start_addr: int = 0, count: int = ROM_SIZE_WORDS) -> array:
+    """Read flash memory contents (element i holds address start_addr + i)."""
     print(f"\n[READ] Reading {count} words from 0x{start_addr:04X}...")
     enter_programming_mode(hw)
 
@@ -552,105 +737,112 @@ def read_flash(hw: Hardware, start_addr: int = 0, count: int = ROM_SIZE_WORDS) -
     reset_address(hw)
 
     # Skip to start address
-    for _ in range(start_addr):
-        increment_address(hw)
+    skip_addresses(hw, start_addr)
 
-    memory = {}
+    memory = blank_image(count)
     for i in range(count):
-        addr = start_addr + i
-        word = read_word(hw)
-        memory[addr] = word
+        memory[i] = read_word(hw)
         increment_address(hw)
 
-        if (i + 1) % 64 == 0:
-            sys.stdout.write(".")
-            sys.stdout.flush()
-
-    print(f"\n[READ] Read complete")
+    print(f"[READ] Read complete ({count}/{count} words)")
     exit_programming_mode(hw)
     return memory
 
-def program_flash(hw: Hardware, hex_file: str):
-    """Program flash memory from HEX file."""
-    memory = parse_hex_file(hex_file)
-    if not memory:
-        print("[PROG] No data to program")
-        return
-
-    max_addr = max(memory.keys())
-    print(f"\n[PROG] Programming {len(memory)} words (0x0000 - 0x{max_addr:04X})")
-
-    enter_programming_mode(hw)
-
+def _program_image(hw: Hardware, memory: array, end: int) -> int:
+    """Program words 0..end-1 of memory. Caller holds the programming session."""
     # Select ROM area for writing (firmware pattern from line 8015)
     select_area(hw, AREA_MASK.ROM_WRITE)
     reset_address(hw)
 
-    errors = 0
-    for addr in range(max_addr + 1):
-        word = memory.get(addr, 0x3FFF)
+    # Only program non-blank words; blank runs just advance the counter
+    programmed = [(addr, word) for addr, word in enumerate(memory[:end])
+                  if word != 0x3FFF]
 
-        if word != 0x3FFF:  # Only program non-blank words
-            success = program_word(hw, word)
-            if not success:
-                print(f"\n[PROG] Error at 0x{addr:04X}")
-                errors += 1
+    errors = 0
+    next_addr = 0
+    for addr, word in programmed:
+        skip_addresses(hw, addr - next_addr)
+        success = program_word(hw, word)
+        if not success:
+            print(f"[PROG] Error at 0x{addr:04X}")
+            errors += 1
 
         increment_address(hw)
+        next_addr = addr + 1
 
-        if (addr + 1) % 64 == 0:
-            sys.stdout.write(".")
-            sys.stdout.flush()
-
-    print(f"\n[PROG] Programming complete ({errors} errors)")
-    exit_programming_mode(hw)
-
-def verify_flash(hw: Hardware, hex_file: str) -> bool:
-    """Verify flash memory against HEX file."""
-    memory = parse_hex_file(hex_file)
-    if not memory:
-        print("[VERIFY] No data to verify")
-        return True
+    print(f"[PROG] Programming complete ({len(programmed)} words, {errors} errors)")
+    return errors
 
-    max_addr = max(memory.keys())
-    print(f"\n[VERIFY] Verifying {len(memory)} words...")
-
-    enter_programming_mode(hw)
+def _verify_image(hw: Hardware, memory: array, end: int) -> bool:
+    """Verify words 0..end-1 against memory. Caller holds the programming session."""
+    print(f"\n[VERIFY] Verifying {end} words...")
 
     # Select ROM area for reading
     select_area(hw, AREA_MASK.ROM_READ)
     reset_address(hw)
 
-    errors = 0
-    for addr in range(max_addr + 1):
-        expected = memory.get(addr, 0x3FFF)
-        actual = read_word(hw)
-
-        if actual != expected:
-            print(f"\n[VERIFY] Mismatch at 0x{addr:04X}: expected 0x{expected:04X}, got 0x{actual:04X}")
-            errors += 1
-            if errors > 10:
-                print("[VERIFY] Too many errors, aborting")
-                break
-
+    actual = blank_image(end)
+    for addr in range(end):
+        actual[addr] = read_word(hw)
         increment_address(hw)
 
-        if (addr + 1) % 64 == 0:
-            sys.stdout.write(".")
-            sys.stdout.flush()
+    # Compare the whole image at once; only walk it to report mismatches
+    errors = 0
+    if actual != memory[:end]:
+        mismatches = [addr for addr in range(end) if actual[addr] != memory[addr]]
+        errors = len(mismatches)
+        for addr in mismatches[:10]:
+            print(f"[VERIFY] Mismatch at 0x{addr:04X}: expected 0x{memory[addr]:04X}, got 0x{actual[addr]:04X}")
+        if errors > 10:
+            print(f"[VERIFY] Too many errors ({errors} mismatches), showing first 10")
 
     result = errors == 0
-    print(f"\n[VERIFY] Verification {'PASSED' if result else 'FAILED'}")
-    exit_programming_mode(hw)
+    print(f"[VERIFY] Verification {'PASSED' if result else 'FAILED'}")
     return result
 
+def program_flash(hw: Hardware, hex_file: str, verify: bool = False) -> bool:
+    """
+    Program flash memory from HEX file.
+
+    With verify=True the image is read back within the same programming
+    session, saving a second power-up and entry sequence.
+
+    Returns:
+        True if programming (and verification, if requested) succeeded
+    """
+    memory = parse_hex_file(hex_file)
+    end = image_end(memory)
+    if not end:
+        print("[PROG] No data to program")
+        return True
+
+    used = end - memory[:end].count(0x3FFF)
+    print(f"\n[PROG] Programming {used} words (0x0000 - 0x{end - 1:04X})")
+
+    with programming_session(hw):
+        errors = _program_image(hw, memory, end)
+        if verify:
+            return _verify_image(hw, memory, end) and errors == 0
+    return errors == 0
+
+def verify_flash(hw: Hardware, hex_file: str) -> bool:
+    """Verify flash memory against HEX file."""
+    memory = parse_hex_file(hex_file)
+    end = image_end(memory)
+    if not end:
+        print("[VERIFY] No data to verify")
+        return True
+
+    with programming_session(hw):
+        return _verify_image(hw, memory, end)
+
 def dump_flash(hw: Hardware, output_file: str):
     """Dump flash memory to file."""
     memory = read_flash(hw)
 
-    with open(output_file, 'w') as f:
-        for addr in sorted(memory.keys()):
-            f.write(f"{addr:04X}: {memory[addr]:04X}\n")
+    lines = [f"{addr:04X}: {word:04X}\n" for addr, word in enumerate(memory)]
+    with open(output_file, 'w', buffering=1 << 16) as f:
+        f.write("".join(lines))
 
     print(f"[DUMP] Saved to {output_file}")
 
@@ -700,17 +892,14 @@ ICSP Pinout (6-pin):
     if args.read:
         memory = read_flash(hw)
         print("\nFlash Contents:")
-        for addr in sorted(memory.keys()):
-            if memory[addr] != 0x3FFF:
-                print(f"  0x{addr:04X}: 0x{memory[addr]:04X}")
+        for addr, word in enumerate(memory):
+            if word != 0x3FFF:
+                print(f"  0x{addr:04X}: 0x{word:04X}")
         sys.exit(0)
 
     if args.file:
-        program_flash(hw, args.file)
-        if args.verify:
-            success = verify_flash(hw, args.file)
-            sys.exit(0 if success else 1)
-        sys.exit(0)
+        success = program_flash(hw, args.file, verify=args.verify)
+        sys.exit(0 if success else 1)
 
     if not any([args.check, args.dump, args.read, args.file]):
         parser.print_help()
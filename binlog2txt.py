@@ -0,0 +1,78 @@
+#!/usr/bin/env python3
+"""
+binlog2txt.py - Dump an emulator packet capture (session_*.pkt) as text
+
+Prints the same ">>> RAW/DEC" and "<<< RAW" lines the emulator writes to its
+session log when run with -v, so captures taken without -v can still be read.
+
+Usage: python binlog2txt.py <session.pkt> [output.txt]
+"""
+
+import sys
+import argparse
+import datetime
+
+from emulator import PACKET_MAGIC, PACKET_HEADER, PACKET_RECORD, decrypt_packet
+
+def read_capture(filename):
+    """Yield (direction, timestamp, raw_data) for every packet in a capture"""
+    with open(filename, 'rb') as f:
+        data = f.read()
+
+    if len(data) < PACKET_HEADER.size:
+        raise ValueError(f"{filename} is not an emulator packet capture")
+    magic, start = PACKET_HEADER.unpack_from(data)
+    if magic != PACKET_MAGIC:
+        raise ValueError(f"{filename} is not an emulator packet capture")
+    start_time = datetime.datetime.fromtimestamp(start)
+
+    pos = PACKET_HEADER.size
+    while pos + PACKET_RECORD.size <= len(data):
+        out, ms, length = PACKET_RECORD.unpack_from(data, pos)
+        if pos + PACKET_RECORD.size + length > len(data):
+            break
+        pos += PACKET_RECORD.size
+        raw = data[pos:pos + length]
+        pos += length
+        timestamp = start_time + datetime.timedelta(milliseconds=ms)
+        yield ("OUT" if out else "IN"), timestamp, raw
+
+    # A capture cut off mid-write (e.g. the emulator was killed) ends in a
+    # partial record; say so rather than dropping it silently
+    if pos < len(data):
+        print(f"Warning: {filename} ends with a truncated record "
+              f"({len(data) - pos} bytes at offset {pos} skipped)", file=sys.stderr)
+
+def format_packet(direction, timestamp, raw_data):
+    """Return the session log lines for one packet"""
+    stamp = f"[{timestamp.strftime('%H:%M:%S.%f')[:-3]}]"
+    prefix = ">>> " if direction == "IN" else "<<< "
+    lines = [f"{stamp} {prefix}RAW: {raw_data.hex(' ')}"]
+    if direction == "IN":
+        decrypted, valid = decrypt_packet(raw_data)
+        if decrypted:
+            hex_dec = bytes(decrypted[:decrypted[0]]).hex(' ')
+            valid_str = "" if valid else " [INVALID CHECKSUM]"
+            lines.append(f"{stamp} {prefix}DEC: {hex_dec}{valid_str}")
+    return lines
+
+def main():
+    parser = argparse.ArgumentParser(description='Dump an emulator packet capture as text')
+    parser.add_argument('input', help='Packet capture (session_*.pkt)')
+    parser.add_argument('output', nargs='?', help='Output text file (default: stdout)')
+
+    args = parser.parse_args()
+
+    out = open(args.output, 'w') if args.output else sys.stdout
+    try:
+        for packet in read_capture(args.input):
+            out.write("\n".join(format_packet(*packet)) + "\n")
+    except ValueError as e:
+        print(f"Error: {e}", file=sys.stderr)
+        sys.exit(1)
+    finally:
+        if out is not sys.stdout:
+            out.close()
+
+if __name__ == '__main__':
+    main()
@@ -1,13 +1,23 @@
 import os
 import sys
 import struct
-import random
 import time
 import signal
 import datetime
+import argparse
+import itertools
+import logging
+import selectors
 
 HIDG_DEVICE = "/dev/hidg0"
 
+# How long the main loop waits for a report before flushing the session log
+LOG_FLUSH_INTERVAL = 1.0
+
+# Console echo of the session log. Everything always goes to the log file;
+# the console only shows per-packet traffic with -v.
+logger = logging.getLogger("emulator")
+
 # --- Constants ---
 CMD_READ_VERSION    = 2
 CMD_END_WORK        = 80
@@ -26,27 +36,57 @@ CMD_DOWNLOAD_CONFIG = 100
 CMD_DOWNLOAD_EEDATA = 101
 CMD_DOWNLOAD_BOOTROM= 102
 
+# Binary packet capture (see binlog2txt.py): a header holding the session
+# start time (Unix seconds), then one record per packet holding direction
+# (0 = IN, 1 = OUT), milliseconds since session start and packet length,
+# followed by the raw packet bytes
+PACKET_MAGIC  = b"SCPK"
+PACKET_HEADER = struct.Struct('<4sd')
+PACKET_RECORD = struct.Struct('<BIH')
+MILLISECOND   = datetime.timedelta(milliseconds=1)
+
 class Session:
-    def __init__(self):
+    def __init__(self, capture_packets=False):
         self.start_time = datetime.datetime.now()
         self.session_id = self.start_time.strftime('%Y%m%d_%H%M%S')
         self.log_filename = f"session_{self.session_id}.log"
-        self.flash = {} # offset -> byte
-        self.config = {}
-        self.eeprom = {}
-        self.bootrom = {}
+        # Captured memory regions; unwritten bytes read as 0xFF
+        self.flash = bytearray()
+        self.config = bytearray()
+        self.eeprom = bytearray()
+        self.bootrom = bytearray()
         self.mcu_info = {}
-        self.log_file = open(self.log_filename, "w")
-        self.log(f"=== Session started at {self.start_time} ===")
+        # Lines are batched in a 64 KiB buffer instead of being flushed one
+        # write(2) at a time; flush_log() forces them out
+        self.log_file = open(self.log_filename, "w", buffering=1 << 16)
+        self.log(f"=== Session started at {self.start_time} ===", logging.INFO)
+        # Without -v, packets go to a binary sidecar instead of being
+        # hex-dumped into the log
+        self.packet_file = None
+        if capture_packets:
+            self.packet_filename = f"session_{self.session_id}.pkt"
+            self.packet_file = open(self.packet_filename, "wb", buffering=1 << 16)
+            self.packet_file.write(PACKET_HEADER.pack(PACKET_MAGIC, self.start_time.timestamp()))
+            self.log(f"Capturing packets to {self.packet_filename}", logging.INFO)
 
-    def log(self, message):
+    def log(self, message, level=logging.DEBUG):
         timestamp = datetime.datetime.now().strftime("%H:%M:%S.%f")[:-3]
         msg = f"[{timestamp}] {message}"
-        print(msg)
+        logger.log(level, msg)
         self.log_file.write(msg + "\n")
-        self.log_file.flush()
+
+    def flush_log(self):
+        if not self.log_file.closed:
+            self.log_file.flush()
+        if self.packet_file and not self.packet_file.closed:
+            self.packet_file.flush()
 
     def log_packet(self, direction, raw_data, decrypted_data=None, valid=True):
+        if self.packet_file:
+            ms = (datetime.datetime.now() - self.start_time) // MILLISECOND
+            self.packet_file.write(PACKET_RECORD.pack(direction != "IN", ms, len(raw_data)))
+            self.packet_file.write(raw_data)
+            return
         prefix = ">>> " if direction == "IN" else "<<< "
         hex_raw = raw_data.hex(' ')
         self.log(f"{prefix}RAW: {hex_raw}")
@@ -57,28 +97,25 @@ class Session:
             valid_str = "" if valid else " [INVALID CHECKSUM]"
             self.log(f"{prefix}DEC: {hex_dec}{valid_str}")
 
-    def save_sparse_data(self, data_dict, name_prefix):
-        if not data_dict:
-            return
-        
-        # Sort keys to find ranges
-        offsets = sorted(data_dict.keys())
-        if not offsets:
+    def store(self, region, offset, data):
+        """Copy data into a capture region at offset, padding any gap with 0xFF."""
+        end = offset + len(data)
+        if end > len(region):
+            region.extend(b'\xFF' * (end - len(region)))
+        region[offset:end] = data
+
+    def save_sparse_data(self, data, name_prefix):
+        if not data:
             return
 
         filename = f"{name_prefix}_{self.session_id}.bin"
-        max_addr = offsets[-1]
-        
-        # We save a continuous block from 0 to max_addr, filling holes with 0xFF
-        # Alternatively, we could save multiple blocks if there are huge gaps.
-        # For MCUs, usually it's one or two blocks.
-        output = bytearray([0xFF] * (max_addr + 1))
-        for addr, val in data_dict.items():
-            output[addr] = val
-            
+        max_addr = len(data) - 1
+
+        # The region is one continuous block from 0 to max_addr; holes were
+        # filled with 0xFF as the data arrived (see store()).
         with open(filename, "wb") as f:
-            f.write(output)
-        self.log(f"Saved {name_prefix} data to {filename} (Size: {len(output)} bytes, Max Addr: 0x{max_addr:X})")
+            f.write(data)
+        self.log(f"Saved {name_prefix} data to {filename} (Size: {len(data)} bytes, Max Addr: 0x{max_addr:X})", logging.INFO)
 
     def save_all(self):
         self.save_sparse_data(self.flash, "flash")
@@ -87,119 +124,169 @@ class Session:
         self.save_sparse_data(self.bootrom, "bootrom")
 
     def close(self):
-        self.log("=== Session closed ===")
+        self.log("=== Session closed ===", logging.INFO)
         self.log_file.close()
+        if self.packet_file:
+            self.packet_file.close()
 
 # Global session
 session = None
 
+# XOR_TABLES[key] maps every byte b to b ^ key, so a whole payload is
+# (de)obfuscated with a single bytes.translate() call instead of a loop
+XOR_TABLES = [bytes(b ^ key for b in range(256)) for key in range(256)]
+
 def decrypt_packet(data):
     if len(data) < 64:
         return None, False
-    buf = list(data)
+    buf = bytearray(data)
     length = buf[0]
     if length > 64 or length < 2:
         return buf, False
     key = buf[63]
-    checksum = buf[0]
-    for i in range(1, length):
-        buf[i] ^= key
-        checksum = (checksum + buf[i]) & 0xFF
+    payload = buf[1:length].translate(XOR_TABLES[key])
+    buf[1:length] = payload
+    # sum() over the decoded bytearray already runs in C; summing through a
+    # memoryview or as packed 64-bit words measured slower here
+    checksum = (buf[0] + sum(payload)) & 0xFF
     valid = (checksum == buf[62])
     return buf, valid
 
-def encrypt_packet(payload):
+def _key_stream():
+    """Endless supply of random key bytes, fetched from os.urandom 4 KiB at a time"""
+    while True:
+        yield from os.urandom(4096)
+
+_KEYS = _key_stream()
+
+def encrypt_packet(payload, out=None):
+    """Encrypt payload into a 64-byte report.
+
+    If out is given, the report is written into that bytearray in place and
+    out is returned; otherwise a new bytes object is built.
+    """
     length = len(payload)
     if length > 61: # 64 - 1 (len) - 1 (checksum) - 1 (key)
         length = 61
-    buf = [0] * 64
+    plain = bytes(payload[:length]) # no copy when payload is already bytes
+    buf = bytearray(64) if out is None else out
     buf[0] = length + 1
-    for i in range(length):
-        buf[i+1] = payload[i]
-    key = random.randint(0, 255)
+    key = next(_KEYS)
     buf[63] = key
-    checksum = buf[0]
-    for i in range(1, buf[0]):
-        checksum = (checksum + buf[i]) & 0xFF
-        buf[i] ^= key
-    buf[62] = checksum
-    return bytes(buf)
-
-def handle_command(cmd, decrypted_buf):
-    if cmd == CMD_READ_VERSION:
-        resp = [0] * 30
-        resp[0] = CMD_READ_VERSION
-        # Writer SN: 67305985 -> 04 03 02 01
-        resp[1:5] = [0x01, 0x02, 0x03, 0x04]
-        # Boot Ver: V1.01-190101 -> 9D 1B 01 01
-        resp[17:19] = [0x9D, 0x1B]
-        resp[19:21] = [0x01, 0x01]
-        # App Ver: V1.10-241227 -> 50 24 0A 01
-        resp[21:23] = [0x50, 0x24]
-        resp[23:25] = [0x0A, 0x01]
-        # HW Ver: 1
-        resp[25:29] = [0x01, 0x00, 0x00, 0x00]
-        return encrypt_packet(resp)
-
-    elif cmd == CMD_SEND_MCUTYPE:
-        series = decrypted_buf[2] | (decrypted_buf[3] << 8)
-        mcu_type = decrypted_buf[4] | (decrypted_buf[5] << 8)
-        power = decrypted_buf[6]
-        pins = decrypted_buf[7:11] # VCC, GND, DAT, CLK
-        session.log(f"CMD_SEND_MCUTYPE: Series={series}, Type=0x{mcu_type:04X}, Power={power}, Pins={pins}")
-        return encrypt_packet([0, 2])
-
-    elif cmd == CMD_DOWNLOAD_DATA:
-        offset = decrypted_buf[2] | (decrypted_buf[3] << 8) | (decrypted_buf[4] << 16)
-        data_len = decrypted_buf[0] - 5
-        session.log(f"CMD_DOWNLOAD_DATA: Offset=0x{offset:06X}, Len={data_len}")
-        for i in range(data_len):
-            session.flash[offset + i] = decrypted_buf[5 + i]
-        return encrypt_packet([0, 2])
-
-    elif cmd == CMD_DOWNLOAD_CONFIG:
-        offset = decrypted_buf[2] | (decrypted_buf[3] << 8)
-        data_len = decrypted_buf[0] - 5
-        session.log(f"CMD_DOWNLOAD_CONFIG: Offset=0x{offset:04X}, Len={data_len}")
-        for i in range(data_len):
-            session.config[offset + i] = decrypted_buf[5 + i]
-        return encrypt_packet([0, 2])
-
-    elif cmd == CMD_DOWNLOAD_EEDATA:
-        offset = decrypted_buf[2] | (decrypted_buf[3] << 8)
-        data_len = decrypted_buf[0] - 5
-        session.log(f"CMD_DOWNLOAD_EEDATA: Offset=0x{offset:04X}, Len={data_len}")
-        for i in range(data_len):
-            session.eeprom[offset + i] = decrypted_buf[5 + i]
-        return encrypt_packet([0, 2])
-
-    elif cmd == CMD_DOWNLOAD_OPT1:
-        session.log("CMD_DOWNLOAD_OPT1")
-        return encrypt_packet([0, 2])
-
-    elif cmd == CMD_DOWNLOAD_OPT2:
-        session.log("CMD_DOWNLOAD_OPT2")
-        return encrypt_packet([0, 2])
-
-    elif cmd == CMD_DOWNLOAD_VERIFY:
-        session.log("CMD_DOWNLOAD_VERIFY")
-        return encrypt_packet([0, 2])
-
-    elif cmd == CMD_END_WORK:
-        session.log("CMD_END_WORK - Saving all captured data")
-        session.save_all()
-        return encrypt_packet([0, 2])
-
-    elif cmd == CMD_READ_MCUINFO:
-        session.log("CMD_READ_MCUINFO")
-        resp = [CMD_READ_MCUINFO, 0xAA, 0xBB, 0x01, 0x02, 0x00, 0x01]
-        return encrypt_packet(resp)
-
-    session.log(f"Unknown CMD: {cmd}")
-    return encrypt_packet([0, 2])
+    buf[1:length + 1] = plain.translate(XOR_TABLES[key])
+    buf[length + 1:62] = bytes(61 - length)
+    buf[62] = (buf[0] + sum(plain)) & 0xFF
+    return bytes(buf) if out is None else out
+
+# The CMD_READ_VERSION reply never changes, so it is encrypted ahead of time
+# under a handful of random keys and the handler just rotates through them
+VERSION_PAYLOAD = bytes(
+    [CMD_READ_VERSION]
+    + [0x01, 0x02, 0x03, 0x04]      # Writer SN: 67305985 -> 04 03 02 01
+    + [0x00] * 12
+    + [0x9D, 0x1B, 0x01, 0x01]      # Boot Ver: V1.01-190101 -> 9D 1B 01 01
+    + [0x50, 0x24, 0x0A, 0x01]      # App Ver: V1.10-241227 -> 50 24 0A 01
+    + [0x01, 0x00, 0x00, 0x00]      # HW Ver: 1
+    + [0x00]
+)
+VERSION_PACKETS = itertools.cycle([encrypt_packet(VERSION_PAYLOAD) for _ in range(16)])
+
+# Fixed reply payloads, kept as bytes so encrypt_packet() uses them without copying
+ACK_PAYLOAD = bytes([0, 2])
+MCUINFO_PAYLOAD = bytes([CMD_READ_MCUINFO, 0xAA, 0xBB, 0x01, 0x02, 0x00, 0x01])
+
+# The plain ACK answers most commands; like the version reply it is
+# encrypted up front, under a larger pool of keys since it is sent so often
+ACK_PACKETS = itertools.cycle([encrypt_packet(ACK_PAYLOAD) for _ in range(64)])
+
+def _h_read_version(decrypted_buf, out):
+    out[:] = next(VERSION_PACKETS)
+
+def _h_send_mcutype(decrypted_buf, out):
+    series = int.from_bytes(decrypted_buf[2:4], 'little')
+    mcu_type = int.from_bytes(decrypted_buf[4:6], 'little')
+    power = decrypted_buf[6]
+    pins = list(decrypted_buf[7:11]) # VCC, GND, DAT, CLK
+    session.log(f"CMD_SEND_MCUTYPE: Series={series}, Type=0x{mcu_type:04X}, Power={power}, Pins={pins}")
+    out[:] = next(ACK_PACKETS)
+
+def _h_download_data(decrypted_buf, out):
+    offset = int.from_bytes(decrypted_buf[2:5], 'little')
+    data_len = decrypted_buf[0] - 5
+    session.log(f"CMD_DOWNLOAD_DATA: Offset=0x{offset:06X}, Len={data_len}")
+    if data_len > 0:
+        session.store(session.flash, offset, decrypted_buf[5:5 + data_len])
+    out[:] = next(ACK_PACKETS)
+
+def _h_download_config(decrypted_buf, out):
+    offset = int.from_bytes(decrypted_buf[2:4], 'little')
+    data_len = decrypted_buf[0] - 5
+    session.log(f"CMD_DOWNLOAD_CONFIG: Offset=0x{offset:04X}, Len={data_len}")
+    if data_len > 0:
+        session.store(session.config, offset, decrypted_buf[5:5 + data_len])
+    out[:] = next(ACK_PACKETS)
+
+def _h_download_eedata(decrypted_buf, out):
+    offset = int.from_bytes(decrypted_buf[2:4], 'little')
+    data_len = decrypted_buf[0] - 5
+    session.log(f"CMD_DOWNLOAD_EEDATA: Offset=0x{offset:04X}, Len={data_len}")
+    if data_len > 0:
+        session.store(session.eeprom, offset, decrypted_buf[5:5 + data_len])
+    out[:] = next(ACK_PACKETS)
+
+def _h_download_opt1(decrypted_buf, out):
+    session.log("CMD_DOWNLOAD_OPT1")
+    out[:] = next(ACK_PACKETS)
+
+def _h_download_opt2(decrypted_buf, out):
+    session.log("CMD_DOWNLOAD_OPT2")
+    out[:] = next(ACK_PACKETS)
+
+def _h_download_verify(decrypted_buf, out):
+    session.log("CMD_DOWNLOAD_VERIFY")
+    out[:] = next(ACK_PACKETS)
+
+def _h_end_work(decrypted_buf, out):
+    session.log("CMD_END_WORK - Saving all captured data", logging.INFO)
+    session.save_all()
+    session.flush_log()
+    out[:] = next(ACK_PACKETS)
+
+def _h_read_mcuinfo(decrypted_buf, out):
+    session.log("CMD_READ_MCUINFO")
+    encrypt_packet(MCUINFO_PAYLOAD, out)
+
+def _h_unknown(decrypted_buf, out):
+    session.log(f"Unknown CMD: {decrypted_buf[1]}", logging.WARNING)
+    out[:] = next(ACK_PACKETS)
+
+_DISPATCH = {
+    CMD_READ_VERSION:    _h_read_version,
+    CMD_SEND_MCUTYPE:    _h_send_mcutype,
+    CMD_DOWNLOAD_DATA:   _h_download_data,
+    CMD_DOWNLOAD_CONFIG: _h_download_config,
+    CMD_DOWNLOAD_EEDATA: _h_download_eedata,
+    CMD_DOWNLOAD_OPT1:   _h_download_opt1,
+    CMD_DOWNLOAD_OPT2:   _h_download_opt2,
+    CMD_DOWNLOAD_VERIFY: _h_download_verify,
+    CMD_END_WORK:        _h_end_work,
+    CMD_READ_MCUINFO:    _h_read_mcuinfo,
+}
+
+def handle_command(cmd, decrypted_buf, out):
+    """Run the handler for cmd, which writes its 64-byte reply into out"""
+    _DISPATCH.get(cmd, _h_unknown)(decrypted_buf, out)
 
 def main():
     global session
+    parser = argparse.ArgumentParser(description="SCMCU Writer8 HID emulator")
+    parser.add_argument("-v", "--verbose", action="store_true",
+                        help="Echo every packet and command to the console and "
+                             "hex-dump packets into the session log")
+    args = parser.parse_args()
+    logging.basicConfig(level=logging.DEBUG if args.verbose else logging.INFO,
+                        format="%(message)s", stream=sys.stdout)
+
     if not os.path.exists(HIDG_DEVICE):
         print(f"Error: {HIDG_DEVICE} missing. Run setup_cms.sh first.")
         sys.exit(1)
@@ -207,29 +294,46 @@ def main():
     print(f"Opening {HIDG_DEVICE}...")
     fd = os.open(HIDG_DEVICE, os.O_RDWR)
     
-    session = Session()
+    session = Session(capture_packets=not args.verbose)
     print(f"SCMCU Emulator running. Logging to {session.log_filename}")
 
+    # Steady-state path: bind everything the loop calls per packet to locals
+    # and reuse one request and one response buffer for every exchange
+    readv, write = os.readv, os.write
+    decrypt, handle = decrypt_packet, handle_command
+    log_packet = session.log_packet
+    req_buf = bytearray(64)
+    req_view = memoryview(req_buf)
+    resp_buf = bytearray(64)
+
+    # The fd stays blocking so replies still wait for the host to take the
+    # previous report; select() only decides when a read will not block.
+    # While reports are queued it returns at once, so bursts are drained
+    # back to back, and an idle second becomes a log flush.
+    selector = selectors.DefaultSelector()
+    selector.register(fd, selectors.EVENT_READ)
+    wait = selector.select
+
     try:
         while True:
-            data = os.read(fd, 64)
-            if not data:
+            if not wait(LOG_FLUSH_INTERVAL):
+                session.flush_log()
+                continue
+            n = readv(fd, [req_buf])
+            if not n:
                 continue
+            data = req_view[:n]
 
-            decrypted, valid = decrypt_packet(data)
-            session.log_packet("IN", data, decrypted, valid)
+            decrypted, valid = decrypt(data)
+            log_packet("IN", data, decrypted, valid)
             
             if not valid:
                 continue
             
             cmd = decrypted[1]
-            response = handle_command(cmd, decrypted)
-            
-            if response:
-                if len(response) < 64:
-                    response += b'\x00' * (64 - len(response))
-                os.write(fd, response)
-                session.log_packet("OUT", response)
+            handle(cmd, decrypted, resp_buf)
+            write(fd, resp_buf)
+            log_packet("OUT", resp_buf)
 
     except KeyboardInterrupt:
         print("\nStopping...")
@@ -237,6 +341,9 @@ def main():
             session.save_all()
             session.close()
     finally:
+        selector.close()
+        if session:
+            session.flush_log()
         os.close(fd)
 
 if __name__ == "__main__":
@@ -25,10 +25,18 @@ MCU_DEFS = {
     'SC8P062': (0x400, 0x2007, 2),
 }
 
+# Byte address space kept from the HEX file; ROM and config both sit well
+# inside it, anything above is reported and dropped
+HEX_IMAGE_SIZE = 0x10000
+
 def parse_hex_file(filename):
-    """Parse Intel HEX file and return dict of address -> byte data"""
-    data = {}
+    """Parse Intel HEX file and return a 64 KiB bytearray image indexed by byte address.
+
+    Bytes not covered by any data record read as 0xFF (unprogrammed flash).
+    """
+    data = bytearray(b'\xFF' * HEX_IMAGE_SIZE)
     extended_addr = 0
+    ignored = 0
 
     with open(filename, 'r') as f:
         for line in f:
@@ -36,22 +44,27 @@ def parse_hex_file(filename):
             if not line.startswith(':'):
                 continue
 
-            # Parse record
-            byte_count = int(line[1:3], 16)
-            address = int(line[3:7], 16)
-            record_type = int(line[7:9], 16)
+            # Parse record: decode the whole line once, then pick fields out
+            record = bytes.fromhex(line[1:])
+            byte_count = record[0]
+            address = int.from_bytes(record[1:3], 'big')
+            record_type = record[3]
 
             if record_type == 0x00:  # Data record
                 full_addr = extended_addr + address
-                for i in range(byte_count):
-                    byte_val = int(line[9 + i*2:11 + i*2], 16)
-                    data[full_addr + i] = byte_val
+                end = min(full_addr + byte_count, HEX_IMAGE_SIZE)
+                if end > full_addr:
+                    data[full_addr:end] = record[4:4 + end - full_addr]
+                ignored += byte_count - max(end - full_addr, 0)
             elif record_type == 0x01:  # EOF
                 break
             elif record_type == 0x02:  # Extended segment address
-                extended_addr = int(line[9:13], 16) << 4
+                extended_addr = int.from_bytes(record[4:6], 'big') << 4
             elif record_type == 0x04:  # Extended linear address
-                extended_addr = int(line[9:13], 16) << 16
+                extended_addr = int.from_bytes(record[4:6], 'big') << 16
+
+    if ignored:
+        print(f"  Warning: Ignored {ignored} bytes above 0x{HEX_IMAGE_SIZE - 1:04X}")
 
     return data
 
@@ -68,16 +81,13 @@ def create_scx(hex_data, mcu_name, output_file):
 
     # Initialize SCX buffer
     # Header (160 bytes) + Config area (96 bytes) + ROM data
-    scx_data = bytearray(256 + rom_size_bytes)
-
-    # Fill with 0xFF (unprogrammed flash value)
-    for i in range(len(scx_data)):
-        scx_data[i] = 0xFF
+    # Filled with 0xFF (unprogrammed flash value)
+    scx_data = bytearray(b'\xFF' * (256 + rom_size_bytes))
 
     # Write MCU name (bytes 0-31, bang-terminated)
     mcu_name_bytes = mcu_name.encode('ascii')
-    for i, b in enumerate(mcu_name_bytes[:31]):  # Max 31 chars
-        scx_data[i] = b
+    name = mcu_name_bytes[:31]  # Max 31 chars
+    scx_data[:len(name)] = name
     # Add bang terminator (33) after the name
     if len(mcu_name_bytes) < 32:
         scx_data[len(mcu_name_bytes)] = 33
@@ -89,30 +99,16 @@ def create_scx(hex_data, mcu_name, output_file):
     # In HEX file, ROM is at byte address 0x0000 (word address 0x0000)
     # Each instruction word is stored as 2 bytes
     rom_start_offset = 256
-    for word_addr in range(rom_size_words):
-        byte_addr = word_addr * 2  # HEX file byte address
-
-        low_byte = hex_data.get(byte_addr, 0xFF)
-        high_byte = hex_data.get(byte_addr + 1, 0xFF)
-
-        scx_offset = rom_start_offset + word_addr * 2
-        scx_data[scx_offset] = low_byte
-        scx_data[scx_offset + 1] = high_byte
+    scx_data[rom_start_offset:rom_start_offset + rom_size_bytes] = hex_data[:rom_size_bytes]
 
     # Extract config data from HEX (at address 0x2007 word = 0x400E byte)
     # Config words are stored at specific addresses in HEX file
     config_byte_addr = config_addr * 2  # 0x2007 * 2 = 0x400E
     config_start_offset = 160
 
-    for i in range(config_size):
-        byte_addr = config_byte_addr + i * 2
-        low_byte = hex_data.get(byte_addr, 0xFF)
-        high_byte = hex_data.get(byte_addr + 1, 0xFF)
-
-        # Store config as 16-bit words in config area
-        scx_offset = config_start_offset + i * 2
-        scx_data[scx_offset] = low_byte
-        scx_data[scx_offset + 1] = high_byte
+    # Store config as 16-bit words in config area
+    config_bytes = hex_data[config_byte_addr:config_byte_addr + config_size_bytes]
+    scx_data[config_start_offset:config_start_offset + config_size_bytes] = config_bytes
 
     # Write SCX file
     with open(output_file, 'wb') as f:
@@ -124,11 +120,7 @@ def create_scx(hex_data, mcu_name, output_file):
     print(f"  Config words: {config_size}")
 
     # Print config values found
-    for i in range(config_size):
-        byte_addr = config_byte_addr + i * 2
-        low = hex_data.get(byte_addr, 0xFF)
-        high = hex_data.get(byte_addr + 1, 0xFF)
-        word = (high << 8) | low
+    for i, (word,) in enumerate(struct.iter_unpack('<H', config_bytes)):
         print(f"  Config word {i} @ 0x{config_addr + i:04X}: 0x{word:04X}")
 
 def main():
@@ -141,7 +133,8 @@ def main():
 
     print(f"Reading {args.input}...")
     hex_data = parse_hex_file(args.input)
-    print(f"  Found {len(hex_data)} bytes of data")
+    span = len(hex_data.rstrip(b'\xFF'))
+    print(f"  Image spans {span} bytes (0x0000-0x{max(span - 1, 0):04X})")
 
     create_scx(hex_data, args.mcu, args.output)
 
@@ -30,13 +30,52 @@ class QureyResult(ctypes.Structure):
         ("pResult", ctypes.c_void_p),
     ]
 
+def sql_literal(text):
+    """Quote text as an SQL string literal"""
+    return "'" + text.replace("'", "''") + "'"
+
+def sql_identifier(name):
+    """Quote name as an SQL identifier"""
+    return '"' + name.replace('"', '""') + '"'
+
 def find_file(paths):
+    """Return the first existing path in paths, or None (one stat() per candidate)"""
     for p in paths:
-        if os.path.exists(p):
-            return p
+        try:
+            os.stat(p)
+        except (OSError, ValueError):
+            continue
+        return p
     return None
 
+def load_dll(dll_path):
+    """Load SqlciperDll and declare its function signatures once"""
+    dll = ctypes.CDLL(dll_path)
+
+    # Define function signatures. ctypes is kept on purpose: the script makes
+    # a few dozen DLL calls in total, so per-call FFI cost is negligible next
+    # to the queries themselves, and it keeps the script dependency-free
+    dll.sqlite_connect.argtypes = [ctypes.c_char_p, ctypes.c_char_p]
+    dll.sqlite_connect.restype = ctypes.c_int
+
+    # The vendor DLL returns QureyResult by value and takes it back by value
+    # in sqlite_free; it exports no pointer-out variant, so that ABI is fixed
+    dll.sqlite_query.argtypes = [ctypes.c_char_p]
+    dll.sqlite_query.restype = QureyResult
+
+    dll.sqlite_free.argtypes = [QureyResult]
+    dll.sqlite_free.restype = None
+
+    dll.sqlite_close.argtypes = []
+    dll.sqlite_close.restype = None
+
+    return dll
+
 def main():
+    # The report is hundreds of lines; on a console stdout would otherwise
+    # flush after every one. Buffered output is flushed at exit as usual.
+    sys.stdout.reconfigure(line_buffering=False)
+
     # Find DLL
     dll_path = find_file(dll_paths)
     if not dll_path:
@@ -55,24 +94,11 @@ def main():
 
     # Load DLL
     try:
-        dll = ctypes.CDLL(dll_path)
+        dll = load_dll(dll_path)
     except Exception as e:
         print(f"Error loading DLL: {e}")
         sys.exit(1)
 
-    # Define function signatures
-    dll.sqlite_connect.argtypes = [ctypes.c_char_p, ctypes.c_char_p]
-    dll.sqlite_connect.restype = ctypes.c_int
-
-    dll.sqlite_query.argtypes = [ctypes.c_char_p]
-    dll.sqlite_query.restype = QureyResult
-
-    dll.sqlite_free.argtypes = [QureyResult]
-    dll.sqlite_free.restype = None
-
-    dll.sqlite_close.argtypes = []
-    dll.sqlite_close.restype = None
-
     # Connect to database
     db_path_bytes = db_path.encode('ascii')
     password = b"cmsxc"
@@ -84,55 +110,92 @@ def main():
 
     print("Connected to database successfully!\n")
 
-    # Helper function to execute query
-    def execute_query(sql):
-        sql_bytes = sql.encode('ascii')
-        result = dll.sqlite_query(sql_bytes)
+    # Helper function to execute query; the DLL entry points and helpers it
+    # calls per query/per cell are bound once here
+    sqlite_query, sqlite_free = dll.sqlite_query, dll.sqlite_free
+    char_pp = ctypes.POINTER(ctypes.c_char_p)
+    cast, decode = ctypes.cast, bytes.decode
+
+    def execute_query(sql, max_rows=None, encoding='utf-8'):
+        """Run sql and return (columns, rows); only the first max_rows rows are decoded.
+
+        Cells are decoded as UTF-8. encoding='ascii' tries the cheaper strict
+        ASCII decoder first for identifier-only results and redoes the
+        result as UTF-8 if any cell is not ASCII.
+        """
+        sql_bytes = sql.encode('utf-8')
+        result = sqlite_query(sql_bytes)
 
         if result.nRow <= 0 or result.nColumn <= 0:
+            if result.pResult:
+                sqlite_free(result)
             return [], []
 
-        # Read results
-        total = (result.nRow + 1) * result.nColumn
-        ptr_array = (ctypes.c_void_p * total)()
-        ctypes.memmove(ptr_array, result.pResult, ctypes.sizeof(ptr_array))
-
-        # Extract column names (first row)
-        columns = []
-        for i in range(result.nColumn):
-            if ptr_array[i]:
-                columns.append(ctypes.string_at(ptr_array[i]).decode('utf-8', errors='replace'))
-            else:
-                columns.append(None)
-
-        # Extract data rows
-        rows = []
-        idx = result.nColumn
-        for r in range(result.nRow):
-            row = []
-            for c in range(result.nColumn):
-                if ptr_array[idx]:
-                    row.append(ctypes.string_at(ptr_array[idx]).decode('utf-8', errors='replace'))
-                else:
-                    row.append(None)
-                idx += 1
-            rows.append(row)
-
-        dll.sqlite_free(result)
+        # Read results: pResult points at (nRow + 1) * nColumn C strings,
+        # column names first, then the data rows
+        ncol = result.nColumn
+        nrow = result.nRow if max_rows is None else min(result.nRow, max_rows)
+        total = (nrow + 1) * ncol
+        # Slicing the c_char_p pointer copies every cell out as bytes (or None
+        # for NULL) in one call; one comprehension then decodes the flat list,
+        # which measured faster than filling a pre-sized list by index
+        cells = cast(result.pResult, char_pp)[:total]
+        flat = None
+        if encoding == 'ascii':
+            try:
+                flat = [decode(p, 'ascii') if p is not None else None for p in cells]
+            except UnicodeDecodeError:
+                pass
+        if flat is None:
+            flat = [decode(p, 'utf-8', 'replace') if p is not None else None for p in cells]
+
+        columns = flat[:ncol]
+        rows = [flat[i:i + ncol] for i in range(ncol, total, ncol)]
+
+        sqlite_free(result)
         return columns, rows
 
+    # Everything below only reads, so run it as one transaction (a single
+    # shared lock instead of one per statement) with a larger page cache.
+    # mmap_size is left alone since SQLCipher pages are decrypted on read.
+    execute_query("PRAGMA cache_size=-65536")
+    execute_query("PRAGMA temp_store=MEMORY")
+    execute_query("BEGIN")
+
     # Query 1: Get all tables
     print("=== Tables in database ===")
-    cols, rows = execute_query("SELECT name FROM sqlite_master WHERE type='table'")
-    for row in rows:
-        print(f"  {row[0]}")
+    cols, rows = execute_query("SELECT name FROM sqlite_master WHERE type='table'", encoding='ascii')
+    table_names = [row[0] for row in rows]  # reused by later queries
+    for name in table_names:
+        print(f"  {name}")
+
+    # Column info for every table in one query instead of a PRAGMA
+    # table_info() round trip per table. Rows match table_info's
+    # (cid, name, type, notnull, dflt_value, pk); table names are keyed
+    # upper-case since SQLite matches them case-insensitively. The SQLCipher
+    # build in SqlciperDll has no table-valued pragma functions, so when the
+    # batched query comes back empty table_info() falls back to plain PRAGMA.
+    schemas = {}
+    cols, schema_rows = execute_query(
+        "SELECT m.name, p.cid, p.name, p.type, p.\"notnull\", p.dflt_value, p.pk "
+        "FROM sqlite_master m JOIN pragma_table_info(m.name) p "
+        "WHERE m.type='table' ORDER BY m.name, p.cid"
+    )
+    for row in schema_rows:
+        schemas.setdefault(row[0].upper(), []).append(row[1:])
+
+    def table_info(table_name):
+        if schema_rows:
+            return schemas.get(table_name.upper())
+        cols, rows = execute_query(f"PRAGMA table_info({table_name})")
+        return rows
 
     # Query 2: Get TABLE_SERIES structure and content
     print("\n=== TABLE_SERIES (MCU series definitions) ===")
-    cols, rows = execute_query("SELECT * FROM TABLE_SERIES")
+    cols, rows = execute_query("SELECT * FROM TABLE_SERIES", max_rows=20)
     if cols:
         print(f"Columns: {cols}")
-        for row in rows[:20]:  # First 20
+        for row in rows:  # First 20
             print(f"  {row}")
 
     # Query 3: Search for SC8P in MCU names
@@ -141,12 +204,12 @@ def main():
     if cols:
         print(f"{'MCU_NAME':<20} {'SERIES_NAME':<15} {'ARCH':<10}")
         print("-" * 50)
-        for row in rows:
-            print(f"{row[0]:<20} {row[1]:<15} {row[2]:<10}")
+        row_format = "%-20s %-15s %-10s\n"
+        sys.stdout.writelines(row_format % tuple(row) for row in rows)
 
     # Query 4: Specifically check SC8P052
     print("\n=== SC8P052 details ===")
-    cols, rows = execute_query("SELECT m.*, s.* FROM SCMCU AS m INNER JOIN TABLE_SERIES AS s ON m.MCU_SERIES = s.ID WHERE m.MCU_NAME = 'SC8P052'")
+    cols, rows = execute_query("SELECT m.*, s.* FROM SCMCU AS m INNER JOIN TABLE_SERIES AS s ON m.MCU_SERIES = s.ID WHERE m.MCU_NAME = 'SC8P052'", max_rows=1)
     if cols and rows:
         for i, col in enumerate(cols):
             print(f"  {col}: {rows[0][i]}")
@@ -155,15 +218,14 @@ def main():
 
     # Query 5: Find all C* tables (likely programming tables)
     print("\n=== All C* tables (potential programming parameters) ===")
-    cols, rows = execute_query("SELECT name FROM sqlite_master WHERE type='table' AND name LIKE 'C%' ORDER BY name")
-    if rows:
-        for row in rows:
-            print(f"  {row[0]}")
+    # Filtered from Query 1's list; like LIKE 'C%', the match ignores case
+    for name in sorted(t for t in table_names if t[:1].upper() == 'C'):
+        print(f"  {name}")
 
     # Query 6: Check CXYD table structure and data for series 59 (SC8P052 series)
     print("\n=== CXYD table (Programming parameters) ===")
-    cols, rows = execute_query("PRAGMA table_info(CXYD)")
-    if cols:
+    rows = table_info("CXYD")
+    if rows:
         print("Columns:")
         for row in rows:
             print(f"  {row}")
@@ -184,8 +246,8 @@ def main():
 
     # Query 7: Check CFMT table (Format)
     print("\n=== CFMT table (Format structure) ===")
-    cols, rows = execute_query("PRAGMA table_info(CFMT)")
-    if cols:
+    rows = table_info("CFMT")
+    if rows:
         print("Columns:")
         for row in rows:
             print(f"  {row}")
@@ -199,8 +261,8 @@ def main():
 
     # Query 8: Check CBW table (Byte width?)
     print("\n=== CBW table ===")
-    cols, rows = execute_query("PRAGMA table_info(CBW)")
-    if cols:
+    rows = table_info("CBW")
+    if rows:
         print("Columns:")
         for row in rows:
             print(f"  {row}")
@@ -214,8 +276,8 @@ def main():
 
     # Query 9: Check CJY table
     print("\n=== CJY table ===")
-    cols, rows = execute_query("PRAGMA table_info(CJY)")
-    if cols:
+    rows = table_info("CJY")
+    if rows:
         print("Columns:")
         for row in rows:
             print(f"  {row}")
@@ -229,22 +291,18 @@ def main():
 
     # Query 10: Find timing-related columns
     print("\n=== Tables with timing/delay columns ===")
-    cols, rows = execute_query("""
-        SELECT m.name as table_name, p.name as column_name 
-        FROM sqlite_master m 
-        JOIN pragma_table_info(m.name) p 
-        WHERE m.type='table' 
-        AND (p.name LIKE '%TIME%' OR p.name LIKE '%DELAY%' OR p.name LIKE '%CLK%' OR p.name LIKE '%FREQ%')
-        ORDER BY m.name
-    """)
-    if rows:
-        for row in rows:
-            print(f"  {row[0]}.{row[1]}")
+    # Matched in Python against the column info fetched after Query 1;
+    # upper() gives the same ASCII case-insensitivity as LIKE
+    timing_words = ("TIME", "DELAY", "CLK", "FREQ")
+    for table_name, cid, column_name, *_ in schema_rows:
+        column_upper = column_name.upper()
+        if any(word in column_upper for word in timing_words):
+            print(f"  {table_name}.{column_name}")
 
     # Query 11: Check CKDHM table
     print("\n=== CKDHM table ===")
-    cols, rows = execute_query("PRAGMA table_info(CKDHM)")
-    if cols:
+    rows = table_info("CKDHM")
+    if rows:
         print("Columns:")
         for row in rows:
             print(f"  {row}")
@@ -258,13 +316,23 @@ def main():
 
     # Query 12: Get row counts for all tables
     print("\n=== Table row counts ===")
-    cols, rows = execute_query("SELECT name FROM sqlite_master WHERE type='table' ORDER BY name")
-    if rows:
-        for row in rows:
-            table_name = row[0]
-            count_cols, count_rows = execute_query(f"SELECT COUNT(*) FROM {table_name}")
-            if count_rows:
-                print(f"  {table_name}: {count_rows[0][0]} rows")
+    if table_names:
+        # One compound query counts every table instead of one query per
+        # table; the names come from Query 1 (sorted() matches ORDER BY name).
+        # If any table cannot be counted the whole query fails, so fall back
+        # to counting them one by one and skip only the failing ones.
+        count_sql = " UNION ALL ".join(
+            f"SELECT {sql_literal(name)}, COUNT(*) FROM {sql_identifier(name)}"
+            for name in sorted(table_names)
+        )
+        count_cols, count_rows = execute_query(count_sql, encoding='ascii')
+        if not count_rows:
+            for name in sorted(table_names):
+                cols, rows = execute_query(f"SELECT COUNT(*) FROM {sql_identifier(name)}")
+                if rows:
+                    count_rows.append((name, rows[0][0]))
+        for table_name, count in count_rows:
+            print(f"  {table_name}: {count} rows")
 
     # Query 13: Check version table
     print("\n=== version table ===")
@@ -276,8 +344,8 @@ def main():
 
     # Query 14: Check CJDZ table
     print("\n=== CJDZ table ===")
-    cols, rows = execute_query("PRAGMA table_info(CJDZ)")
-    if cols:
+    rows = table_info("CJDZ")
+    if rows:
         print("Columns:")
         for row in rows:
             print(f"  {row}")
@@ -291,8 +359,8 @@ def main():
 
     # Query 15: Check CJX table
     print("\n=== CJX table ===")
-    cols, rows = execute_query("PRAGMA table_info(CJX)")
-    if cols:
+    rows = table_info("CJX")
+    if rows:
         print("Columns:")
         for row in rows:
             print(f"  {row}")
@@ -305,6 +373,7 @@ def main():
             print(f"  {row}")
 
     # Close database
+    execute_query("COMMIT")
     dll.sqlite_close()
     print("\n" + "="*60)
     print("DATABASE ANALYSIS COMPLETE")